@@ -0,0 +1,79 @@
+"""
+Compiled Simulation Kernel
+
+This module holds the numeric core of the Python fallback simulation.
+It is compiled with Numba when available and runs as plain Python otherwise.
+"""
+
+import os
+
+# Keep compiled kernels in a writable, persistent location
+os.environ.setdefault(
+    "NUMBA_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".numba_cache")
+)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # Numba is optional
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when Numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Constants (read by Numba as compile-time constants)
+NOMINAL_FREQUENCY = 60.0  # Hz
+FREQUENCY_SENSITIVITY = 0.0001  # Hz per MW imbalance
+STABILITY_THRESHOLD = 50.0  # MW threshold for stable operation
+VOLTAGE_BASE = 1.0  # per unit
+VOLTAGE_SENSITIVITY = 0.00005  # pu per MW imbalance
+
+@njit(cache=True)
+def _core(load_mw, generation_mw):
+    """
+    Compute the numeric simulation fields for one load/generation pair.
+    
+    Args:
+        load_mw: Load in megawatts
+        generation_mw: Generation in megawatts
+        
+    Returns:
+        tuple: (power_imbalance, system_frequency, frequency_deviation,
+                voltage_pu, status_code, efficiency)
+                where status_code is 0=CRITICAL, 1=WARNING, 2=STABLE
+    """
+    # Calculate power imbalance
+    power_imbalance = generation_mw - load_mw
+    
+    # Calculate frequency deviation
+    frequency_deviation = power_imbalance * FREQUENCY_SENSITIVITY
+    system_frequency = NOMINAL_FREQUENCY + frequency_deviation
+    
+    # Calculate voltage stability, clamped between 0.85 and 1.15 pu
+    voltage_pu = VOLTAGE_BASE + power_imbalance * VOLTAGE_SENSITIVITY
+    if voltage_pu < 0.85:
+        voltage_pu = 0.85
+    elif voltage_pu > 1.15:
+        voltage_pu = 1.15
+    
+    # Determine stability status
+    abs_imbalance = abs(power_imbalance)
+    if abs_imbalance <= STABILITY_THRESHOLD:
+        status_code = 2
+    elif abs_imbalance <= STABILITY_THRESHOLD * 2:
+        status_code = 1
+    else:
+        status_code = 0
+    
+    # Calculate efficiency
+    if generation_mw > 0:
+        efficiency = min(load_mw / generation_mw * 100.0, 100.0)
+    else:
+        efficiency = 0.0
+    
+    return (power_imbalance, system_frequency, frequency_deviation,
+            voltage_pu, status_code, efficiency)
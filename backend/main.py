@@ -5,19 +5,26 @@ This server provides REST API endpoints to run grid simulations
 and retrieve results. It connects to MATLAB Engine when available.
 """
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Annotated, List, Optional
+import asyncio
 import logging
+import os
+import orjson
 from contextlib import asynccontextmanager
 
 from matlab_engine import (
     initialize_matlab_engine,
     shutdown_matlab_engine,
     is_matlab_available,
-    run_simulation
+    run_simulation,
+    run_simulation_batch,
+    warm_up_simulation
 )
 
 # Configure logging
@@ -25,7 +32,9 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-# Pydantic models for request/response validation
+# Pydantic models for request/response validation.
+# Response models only document the API; results are built by our own
+# simulation code and returned as dicts without re-validation.
 class SimulationRequest(BaseModel):
     """Request model for simulation endpoint"""
     load_mw: float = Field(..., ge=0, description="System load in megawatts (MW)")
@@ -39,6 +48,25 @@ class SimulationRequest(BaseModel):
         return v
 
 
+# Batch values share SimulationRequest's limits (0 to 100,000 MW, finite)
+BatchValue = Annotated[float, Field(ge=0, le=100000, allow_inf_nan=False)]
+
+# Upper bound on scenarios per batch request
+MAX_BATCH_SIZE = 10000
+
+
+class BatchRequest(BaseModel):
+    """Request model for batch simulation endpoint"""
+    loads: List[BatchValue] = Field(..., max_length=MAX_BATCH_SIZE, description="System loads in megawatts (MW)")
+    generations: List[BatchValue] = Field(..., max_length=MAX_BATCH_SIZE, description="System generations in megawatts (MW)")
+    
+    @model_validator(mode='after')
+    def validate_matching_lengths(self):
+        if len(self.loads) != len(self.generations):
+            raise ValueError('loads and generations must have the same length')
+        return self
+
+
 class SimulationResponse(BaseModel):
     """Response model for simulation endpoint"""
     timestamp: str
@@ -70,6 +98,7 @@ async def lifespan(app: FastAPI):
     # Startup: Initialize MATLAB Engine
     logger.info("Starting up FastAPI server...")
     initialize_matlab_engine()
+    warm_up_simulation()
     
     yield
     
@@ -83,49 +112,67 @@ app = FastAPI(
     title="Power Grid Simulation API",
     description="REST API for simulating power grid operations",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# Configure CORS to allow requests from web frontend
+# Configure CORS to allow requests from web frontend.
+# ALLOWED_ORIGINS is a comma-separated list of origins.
+ALLOWED_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("ALLOWED_ORIGINS", "http://localhost:8080,http://127.0.0.1:8080").split(",")
+    if origin.strip()
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, specify exact origins
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
 
+# Constant responses, serialized once at import time
+_ROOT_BYTES = orjson.dumps({
+    "message": "Power Grid Simulation API",
+    "version": "1.0.0",
+    "endpoints": {
+        "health": "/health",
+        "simulate": "/api/simulate",
+        "simulate_batch": "/api/simulate_batch",
+        "docs": "/docs"
+    }
+})
+
+# Health responses keyed by MATLAB availability
+_HEALTH_BYTES = {
+    matlab_status: orjson.dumps({
+        "status": "healthy",
+        "matlab_available": matlab_status,
+        "simulation_mode": "MATLAB" if matlab_status else "PYTHON_FALLBACK"
+    })
+    for matlab_status in (True, False)
+}
+
+
 @app.get("/", response_model=dict)
 async def root():
     """Root endpoint with API information"""
-    return {
-        "message": "Power Grid Simulation API",
-        "version": "1.0.0",
-        "endpoints": {
-            "health": "/health",
-            "simulate": "/api/simulate",
-            "docs": "/docs"
-        }
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 
-@app.get("/health", response_model=HealthResponse)
+@app.get("/health", response_model=None, responses={200: {"model": HealthResponse}})
 async def health_check():
     """
     Health check endpoint.
     Returns server status and MATLAB availability.
     """
-    matlab_status = is_matlab_available()
-    
-    return {
-        "status": "healthy",
-        "matlab_available": matlab_status,
-        "simulation_mode": "MATLAB" if matlab_status else "PYTHON_FALLBACK"
-    }
+    return Response(content=_HEALTH_BYTES[is_matlab_available()], media_type="application/json")
 
 
-@app.post("/api/simulate", response_model=SimulationResponse)
+@app.post("/api/simulate", response_model=None, responses={200: {"model": SimulationResponse}})
 async def simulate_grid(request: SimulationRequest):
     """
     Run a grid simulation with specified load and generation values.
@@ -142,8 +189,11 @@ async def simulate_grid(request: SimulationRequest):
     try:
         logger.info(f"Running simulation: Load={request.load_mw} MW, Generation={request.generation_mw} MW")
         
-        # Run the simulation
-        result = run_simulation(request.load_mw, request.generation_mw)
+        # Run the simulation; MATLAB calls block, so keep them off the event loop
+        if is_matlab_available():
+            result = await asyncio.to_thread(run_simulation, request.load_mw, request.generation_mw)
+        else:
+            result = run_simulation(request.load_mw, request.generation_mw)
         
         logger.info(f"Simulation completed: Status={result['stability_status']}")
         
@@ -163,16 +213,59 @@ async def simulate_grid(request: SimulationRequest):
         )
 
 
+@app.post("/api/simulate_batch", response_model=None, responses={200: {"model": List[SimulationResponse]}})
+async def simulate_grid_batch(request: BatchRequest):
+    """
+    Run grid simulations for many load/generation pairs in a single call.
+    
+    Args:
+        request: BatchRequest containing equal-length loads and generations lists
+        
+    Returns:
+        List of SimulationResponse, one per input pair
+        
+    Raises:
+        HTTPException: If simulation fails
+    """
+    try:
+        logger.info(f"Running batch simulation: {len(request.loads)} scenarios")
+        
+        # Run all scenarios with one vectorized call; MATLAB calls block, so keep them off the event loop
+        if is_matlab_available():
+            results = await asyncio.to_thread(run_simulation_batch, request.loads, request.generations)
+        else:
+            results = run_simulation_batch(request.loads, request.generations)
+        
+        logger.info(f"Batch simulation completed: {len(results)} results")
+        
+        return results
+        
+    except ValueError as e:
+        logger.error(f"Validation error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Batch simulation error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Simulation failed: {str(e)}"
+        )
+
+
 @app.get("/api/status")
 async def get_system_status():
     """
     Get detailed system status information.
     """
+    matlab_status = is_matlab_available()
+    
     return {
         "server": "running",
         "matlab_engine": {
-            "available": is_matlab_available(),
-            "mode": "MATLAB" if is_matlab_available() else "PYTHON_FALLBACK"
+            "available": matlab_status,
+            "mode": "MATLAB" if matlab_status else "PYTHON_FALLBACK"
         },
         "api_version": "1.0.0"
     }
@@ -182,7 +275,7 @@ async def get_system_status():
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Custom HTTP exception handler"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": exc.detail,
@@ -191,11 +284,20 @@ async def http_exception_handler(request, exc):
     )
 
 
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request, exc):
+    """Request validation handler; orjson writes rejected NaN/inf inputs as null"""
+    return ORJSONResponse(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        content={"detail": jsonable_encoder(exc.errors())}
+    )
+
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     """General exception handler for unexpected errors"""
     logger.error(f"Unexpected error: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "error": "Internal server error",
@@ -205,13 +307,21 @@ async def general_exception_handler(request, exc):
 
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
     
-    # Run the server
+    # DEV=1 enables auto-reload and per-request access logs
+    dev_mode = bool(int(os.getenv("DEV", "0")))
+    
+    # Run the server (uvloop is not available on Windows)
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
-        log_level="info"
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        reload=dev_mode,
+        workers=int(os.getenv("WORKERS", "1")),
+        access_log=dev_mode,
+        log_level=os.getenv("LOG_LEVEL", "info")
     )
@@ -6,87 +6,210 @@ a fallback simulation mode when MATLAB is not available.
 """
 
 import json
+import os
+import queue
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Sequence
 import logging
 
+import numpy as np
+
+from _sim_core import (
+    _core,
+    NUMBA_AVAILABLE,
+    NOMINAL_FREQUENCY,
+    FREQUENCY_SENSITIVITY,
+    STABILITY_THRESHOLD,
+    VOLTAGE_BASE,
+    VOLTAGE_SENSITIVITY
+)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Global MATLAB engine instance
-_matlab_engine = None
-_matlab_available = False
+# Directory containing grid_simulation.m; used as the MATLAB startup folder
+MATLAB_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'matlab'))
+
+# Pool of MATLAB engine instances; requests borrow one engine at a time
+_MATLAB_POOL_SIZE = max(1, int(os.getenv("MATLAB_POOL_SIZE", "2")))
+# Seconds to wait for a free engine (when borrowing or shutting down)
+_MATLAB_ENGINE_TIMEOUT = float(os.getenv("MATLAB_ENGINE_TIMEOUT", "30"))
+
+
+class _EngineState:
+    """Shared MATLAB engine state: availability flag, engine pool and all started engines."""
+    __slots__ = ('available', 'pool', 'engines')
+    
+    def __init__(self):
+        self.available = False
+        self.pool: "queue.Queue" = queue.Queue()
+        self.engines: List[Any] = []
+
+
+engine_state = _EngineState()
+
+# Fields of the MATLAB result struct, grouped by Python type
+_NUMERIC_FIELDS = (
+    'load_mw', 'generation_mw', 'power_imbalance_mw', 'system_frequency_hz',
+    'frequency_deviation_hz', 'voltage_pu', 'stability_index', 'efficiency_percent'
+)
+_STRING_FIELDS = ('stability_status', 'warning')
+
+# (stability_status, stability_index, warning) indexed by
+# status_code * 2 + (1 if power_imbalance > 0 else 0),
+# where status_code is 0=CRITICAL, 1=WARNING, 2=STABLE
+_STATUS_TABLE = (
+    ('CRITICAL', 0.0, 'CRITICAL: Load exceeds generation. Increase generation or shed load.'),
+    ('CRITICAL', 0.0, 'CRITICAL: Excess generation detected. Reduce generation or increase load.'),
+    ('WARNING', 0.5, 'WARNING: Power imbalance detected. System approaching instability.'),
+    ('WARNING', 0.5, 'WARNING: Power imbalance detected. System approaching instability.'),
+    ('STABLE', 1.0, 'System operating within normal parameters.'),
+    ('STABLE', 1.0, 'System operating within normal parameters.'),
+)
+_STATUS_NAMES = np.array([row[0] for row in _STATUS_TABLE])
+_STATUS_INDICES = np.array([row[1] for row in _STATUS_TABLE])
+_STATUS_WARNINGS = np.array([row[2] for row in _STATUS_TABLE])
+
+# MATLAB results are cached by exact (load, generation) inputs.
+# Set SIMULATION_CACHE_MATLAB=0 to always call MATLAB instead of reusing results.
+_CACHE_MATLAB_RESULTS = os.getenv("SIMULATION_CACHE_MATLAB", "1") != "0"
+
+# Last formatted second for timestamps: (epoch_second, 'YYYY-MM-DDTHH:MM:SS').
+# Replaced as a whole tuple so threads never see a half-updated pair.
+_ts_cache = (0, '')
+
+
+def _fast_iso() -> str:
+    """
+    Return the current local time in ISO 8601 format with microseconds.
+    The second-resolution prefix is formatted once per second and reused.
+    """
+    global _ts_cache
+    
+    t = time.time()
+    sec = int(t)
+    cached_sec, prefix = _ts_cache
+    if sec != cached_sec:
+        prefix = datetime.fromtimestamp(sec).strftime('%Y-%m-%dT%H:%M:%S')
+        _ts_cache = (sec, prefix)
+    return f"{prefix}.{int((t - sec) * 1e6):06d}"
 
 
 def initialize_matlab_engine(matlab_path: Optional[str] = None) -> bool:
     """
-    Initialize the MATLAB Engine connection.
+    Initialize the pool of MATLAB Engine connections.
+    The pool size is read from the MATLAB_POOL_SIZE environment variable (default 2).
     
     Args:
-        matlab_path: Optional path to MATLAB installation
+        matlab_path: Optional MATLAB startup folder (defaults to MATLAB_SRC)
         
     Returns:
-        bool: True if MATLAB Engine is successfully initialized, False otherwise
+        bool: True if at least one MATLAB Engine is successfully initialized, False otherwise
     """
-    global _matlab_engine, _matlab_available
-    
     try:
         import matlab.engine
-        logger.info("Attempting to start MATLAB Engine...")
+        logger.info(f"Attempting to start {_MATLAB_POOL_SIZE} MATLAB Engine(s)...")
         
-        if matlab_path:
-            _matlab_engine = matlab.engine.start_matlab(f"-sd {matlab_path}")
-        else:
-            _matlab_engine = matlab.engine.start_matlab()
+        # Start all engines in the background so they boot in parallel.
+        # The startup folder is on the MATLAB search path, so no addpath is needed.
+        options = f'-sd "{matlab_path or MATLAB_SRC}"'
+        futures = [matlab.engine.start_matlab(options, background=True) for _ in range(_MATLAB_POOL_SIZE)]
         
-        # Add the matlab directory to MATLAB path
-        try:
-            _matlab_engine.addpath('../matlab', nargout=0)
-            logger.info("Added matlab directory to MATLAB path")
-        except Exception as e:
-            logger.warning(f"Could not add matlab directory to path: {e}")
+        for future in futures:
+            try:
+                engine = future.result()
+            except Exception as e:
+                logger.error(f"Failed to start MATLAB Engine: {e}")
+                continue
+            
+            engine_state.engines.append(engine)
+            engine_state.pool.put(engine)
+        
+        if not engine_state.engines:
+            raise RuntimeError("No MATLAB Engine could be started")
         
-        _matlab_available = True
-        logger.info("MATLAB Engine started successfully")
+        engine_state.available = True
+        logger.info(f"MATLAB Engine pool started successfully ({len(engine_state.engines)} engine(s))")
         return True
         
     except ImportError:
         logger.warning("MATLAB Engine for Python not installed. Using fallback simulation mode.")
-        _matlab_available = False
+        engine_state.available = False
         return False
     except Exception as e:
         logger.error(f"Failed to start MATLAB Engine: {e}")
         logger.warning("Using fallback simulation mode.")
-        _matlab_available = False
+        engine_state.available = False
         return False
 
 
 def is_matlab_available() -> bool:
     """Check if MATLAB Engine is available."""
-    return _matlab_available
+    return engine_state.available
 
 
+@contextmanager
 def get_matlab_engine():
-    """Get the MATLAB Engine instance."""
-    if not _matlab_available:
+    """
+    Borrow a MATLAB Engine instance from the pool.
+    Blocks until an engine is free and returns it to the pool on exit.
+    Raises RuntimeError if no engine becomes free within MATLAB_ENGINE_TIMEOUT seconds.
+    
+    Example:
+        with get_matlab_engine() as engine:
+            engine.grid_simulation(1000.0, 1050.0)
+    """
+    if not engine_state.available:
         raise RuntimeError("MATLAB Engine is not available")
-    return _matlab_engine
+    
+    try:
+        engine = engine_state.pool.get(timeout=_MATLAB_ENGINE_TIMEOUT)
+    except queue.Empty:
+        raise RuntimeError("No MATLAB Engine became free in time")
+    
+    try:
+        yield engine
+    finally:
+        engine_state.pool.put(engine)
 
 
 def shutdown_matlab_engine():
-    """Shutdown the MATLAB Engine."""
-    global _matlab_engine, _matlab_available
+    """Shutdown all MATLAB Engines in the pool."""
+    engine_state.available = False
     
-    if _matlab_engine is not None:
+    # Take every engine back from the pool, waiting for in-flight calls to
+    # return theirs; only engines we hold are safe to quit
+    engines = engine_state.engines
+    engine_state.engines = []
+    for remaining in range(len(engines), 0, -1):
         try:
-            _matlab_engine.quit()
+            engine = engine_state.pool.get(timeout=_MATLAB_ENGINE_TIMEOUT)
+        except queue.Empty:
+            logger.warning(f"{remaining} MATLAB Engine(s) still in use at shutdown; leaving them running")
+            break
+        
+        try:
+            engine.quit()
             logger.info("MATLAB Engine shut down successfully")
         except Exception as e:
             logger.error(f"Error shutting down MATLAB Engine: {e}")
-        finally:
-            _matlab_engine = None
-            _matlab_available = False
+
+
+def warm_up_simulation():
+    """
+    Run the fallback kernel once so Numba compiles (or loads its cache)
+    before the first request is served.
+    """
+    if not NUMBA_AVAILABLE:
+        logger.info("Numba not installed; fallback kernel runs as plain Python")
+        return
+    
+    _core(100.0, 100.0)
+    logger.info("Numba kernel warmed")
 
 
 def run_matlab_simulation(load_mw: float, generation_mw: float) -> Dict[str, Any]:
@@ -100,28 +223,16 @@ def run_matlab_simulation(load_mw: float, generation_mw: float) -> Dict[str, Any
     Returns:
         dict: Simulation results
     """
-    if not _matlab_available or _matlab_engine is None:
-        raise RuntimeError("MATLAB Engine is not available")
-    
     try:
-        # Call MATLAB function
-        result = _matlab_engine.grid_simulation(float(load_mw), float(generation_mw))
+        # Call MATLAB function on a pooled engine
+        with get_matlab_engine() as engine:
+            result = engine.grid_simulation(float(load_mw), float(generation_mw))
         
         # Convert MATLAB struct to Python dict
-        result_dict = {
-            'timestamp': str(datetime.now().isoformat()),
-            'load_mw': float(result['load_mw']),
-            'generation_mw': float(result['generation_mw']),
-            'power_imbalance_mw': float(result['power_imbalance_mw']),
-            'system_frequency_hz': float(result['system_frequency_hz']),
-            'frequency_deviation_hz': float(result['frequency_deviation_hz']),
-            'voltage_pu': float(result['voltage_pu']),
-            'stability_status': str(result['stability_status']),
-            'stability_index': float(result['stability_index']),
-            'efficiency_percent': float(result['efficiency_percent']),
-            'warning': str(result['warning']),
-            'simulation_mode': 'MATLAB'
-        }
+        result_dict = {key: float(result[key]) for key in _NUMERIC_FIELDS}
+        result_dict.update({key: str(result[key]) for key in _STRING_FIELDS})
+        result_dict['timestamp'] = _fast_iso()
+        result_dict['simulation_mode'] = 'MATLAB'
         
         return result_dict
         
@@ -130,6 +241,58 @@ def run_matlab_simulation(load_mw: float, generation_mw: float) -> Dict[str, Any
         raise
 
 
+def _matlab_row(value) -> List[Any]:
+    """Convert a MATLAB row vector or cell array (or 1x1 scalar) to a Python list."""
+    if isinstance(value, (float, int, str)):
+        return [value]
+    if isinstance(value, list):
+        return value
+    return list(value[0])
+
+
+def run_matlab_simulation_batch(loads: Sequence[float], generations: Sequence[float]) -> List[Dict[str, Any]]:
+    """
+    Run the grid simulation for many (load, generation) pairs with a single
+    call to the vectorized MATLAB function grid_simulation_vec.
+    
+    Args:
+        loads: Loads in megawatts
+        generations: Generations in megawatts (same length as loads)
+        
+    Returns:
+        list: One simulation result dict per input pair
+    """
+    if len(loads) != len(generations):
+        raise ValueError("Loads and generations must be of equal length")
+    if not loads:
+        return []
+    
+    try:
+        import matlab
+        
+        ml_loads = matlab.double([float(v) for v in loads], size=(1, len(loads)))
+        ml_generations = matlab.double([float(v) for v in generations], size=(1, len(generations)))
+        
+        # Call MATLAB function on a pooled engine
+        with get_matlab_engine() as engine:
+            result = engine.grid_simulation_vec(ml_loads, ml_generations)
+        
+        # Convert MATLAB struct of arrays to a list of Python dicts
+        columns = {key: [float(v) for v in _matlab_row(result[key])] for key in _NUMERIC_FIELDS}
+        columns.update({key: [str(v) for v in _matlab_row(result[key])] for key in _STRING_FIELDS})
+        timestamp = _fast_iso()
+        
+        return [
+            dict({key: values[i] for key, values in columns.items()},
+                 timestamp=timestamp, simulation_mode='MATLAB')
+            for i in range(len(loads))
+        ]
+        
+    except Exception as e:
+        logger.error(f"Error running MATLAB batch simulation: {e}")
+        raise
+
+
 def run_fallback_simulation(load_mw: float, generation_mw: float) -> Dict[str, Any]:
     """
     Run a Python-based fallback simulation when MATLAB is not available.
@@ -146,55 +309,16 @@ def run_fallback_simulation(load_mw: float, generation_mw: float) -> Dict[str, A
     if load_mw < 0 or generation_mw < 0:
         raise ValueError("Load and generation must be non-negative")
     
-    # Constants
-    NOMINAL_FREQUENCY = 60.0  # Hz
-    FREQUENCY_SENSITIVITY = 0.0001  # Hz per MW imbalance
-    STABILITY_THRESHOLD = 50  # MW threshold for stable operation
-    VOLTAGE_BASE = 1.0  # per unit
-    VOLTAGE_SENSITIVITY = 0.00005  # pu per MW imbalance
+    # Numeric core (Numba-compiled when available)
+    (power_imbalance, system_frequency, frequency_deviation,
+     voltage_pu, status_code, efficiency) = _core(float(load_mw), float(generation_mw))
     
-    # Calculate power imbalance
-    power_imbalance = generation_mw - load_mw
-    
-    # Calculate frequency deviation
-    frequency_deviation = power_imbalance * FREQUENCY_SENSITIVITY
-    system_frequency = NOMINAL_FREQUENCY + frequency_deviation
-    
-    # Calculate voltage stability
-    voltage_pu = VOLTAGE_BASE + (power_imbalance * VOLTAGE_SENSITIVITY)
-    voltage_pu = max(0.85, min(1.15, voltage_pu))
-    
-    # Determine stability status
-    if abs(power_imbalance) <= STABILITY_THRESHOLD:
-        stability_status = 'STABLE'
-        stability_index = 1.0
-    elif abs(power_imbalance) <= STABILITY_THRESHOLD * 2:
-        stability_status = 'WARNING'
-        stability_index = 0.5
-    else:
-        stability_status = 'CRITICAL'
-        stability_index = 0.0
-    
-    # Calculate efficiency
-    if generation_mw > 0:
-        efficiency = min(load_mw / generation_mw * 100, 100)
-    else:
-        efficiency = 0
-    
-    # Generate warning message
-    if stability_status == 'CRITICAL':
-        if power_imbalance > 0:
-            warning = 'CRITICAL: Excess generation detected. Reduce generation or increase load.'
-        else:
-            warning = 'CRITICAL: Load exceeds generation. Increase generation or shed load.'
-    elif stability_status == 'WARNING':
-        warning = 'WARNING: Power imbalance detected. System approaching instability.'
-    else:
-        warning = 'System operating within normal parameters.'
+    # Look up status and warning message
+    stability_status, stability_index, warning = _STATUS_TABLE[status_code * 2 + (power_imbalance > 0)]
     
     # Build result dictionary
     result = {
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': _fast_iso(),
         'load_mw': load_mw,
         'generation_mw': generation_mw,
         'power_imbalance_mw': power_imbalance,
@@ -211,9 +335,82 @@ def run_fallback_simulation(load_mw: float, generation_mw: float) -> Dict[str, A
     return result
 
 
+def run_fallback_simulation_batch(loads: Sequence[float], generations: Sequence[float]) -> List[Dict[str, Any]]:
+    """
+    Run the Python fallback simulation for many (load, generation) pairs at once.
+    Uses the same logic as run_fallback_simulation, evaluated with NumPy array
+    operations instead of per-pair Python branches.
+    
+    Args:
+        loads: Loads in megawatts
+        generations: Generations in megawatts (same length as loads)
+        
+    Returns:
+        list: One simulation result dict per input pair
+    """
+    load = np.asarray(loads, dtype=np.float64)
+    gen = np.asarray(generations, dtype=np.float64)
+    
+    # Input validation
+    if load.shape != gen.shape or load.ndim != 1:
+        raise ValueError("Loads and generations must be one-dimensional and of equal length")
+    if (load < 0).any() or (gen < 0).any():
+        raise ValueError("Load and generation must be non-negative")
+    
+    # Same constants (from _sim_core) and equations as run_fallback_simulation
+    power_imbalance = gen - load
+    frequency_deviation = power_imbalance * FREQUENCY_SENSITIVITY
+    system_frequency = NOMINAL_FREQUENCY + frequency_deviation
+    voltage_pu = np.clip(VOLTAGE_BASE + power_imbalance * VOLTAGE_SENSITIVITY, 0.85, 1.15)
+    
+    abs_imbalance = np.abs(power_imbalance)
+    status_code = np.select(
+        [abs_imbalance <= STABILITY_THRESHOLD, abs_imbalance <= STABILITY_THRESHOLD * 2], [2, 1], 0
+    )
+    status_key = status_code * 2 + (power_imbalance > 0)
+    stability_status = _STATUS_NAMES[status_key]
+    stability_index = _STATUS_INDICES[status_key]
+    warning = _STATUS_WARNINGS[status_key]
+    
+    efficiency = np.where(gen > 0, np.minimum(load / np.maximum(gen, 1e-12) * 100, 100), 0.0)
+    
+    timestamp = _fast_iso()
+    columns = zip(
+        load.tolist(), gen.tolist(), power_imbalance.tolist(), system_frequency.tolist(),
+        frequency_deviation.tolist(), voltage_pu.tolist(), stability_status.tolist(),
+        stability_index.tolist(), efficiency.tolist(), warning.tolist()
+    )
+    
+    return [
+        {
+            'timestamp': timestamp,
+            'load_mw': l,
+            'generation_mw': g,
+            'power_imbalance_mw': imb,
+            'system_frequency_hz': freq,
+            'frequency_deviation_hz': dev,
+            'voltage_pu': volt,
+            'stability_status': st,
+            'stability_index': si,
+            'efficiency_percent': eff,
+            'warning': warn,
+            'simulation_mode': 'PYTHON_FALLBACK'
+        }
+        for l, g, imb, freq, dev, volt, st, si, eff, warn in columns
+    ]
+
+
+@lru_cache(maxsize=4096)
+def _cached_matlab_simulation(load_mw: float, generation_mw: float) -> Dict[str, Any]:
+    """Cached MATLAB simulation (the stored timestamp is stale)."""
+    return run_matlab_simulation(load_mw, generation_mw)
+
+
 def run_simulation(load_mw: float, generation_mw: float) -> Dict[str, Any]:
     """
     Run the grid simulation using MATLAB if available, otherwise use fallback.
+    MATLAB results are cached by exact inputs; cached results are returned as
+    a fresh copy with a current timestamp.
     
     Args:
         load_mw: Load in megawatts
@@ -222,11 +419,42 @@ def run_simulation(load_mw: float, generation_mw: float) -> Dict[str, Any]:
     Returns:
         dict: Simulation results
     """
-    if _matlab_available:
+    avail = engine_state.available
+    
+    if avail:
         try:
-            return run_matlab_simulation(load_mw, generation_mw)
+            if not _CACHE_MATLAB_RESULTS:
+                return run_matlab_simulation(load_mw, generation_mw)
+            result = dict(_cached_matlab_simulation(load_mw, generation_mw))
         except Exception as e:
             logger.error(f"MATLAB simulation failed, falling back to Python: {e}")
             return run_fallback_simulation(load_mw, generation_mw)
     else:
         return run_fallback_simulation(load_mw, generation_mw)
+    
+    # Echo the caller's inputs (the cache treats e.g. 1000 and 1000.0 as one key)
+    result['load_mw'] = load_mw
+    result['generation_mw'] = generation_mw
+    result['timestamp'] = _fast_iso()
+    return result
+
+
+def run_simulation_batch(loads: Sequence[float], generations: Sequence[float]) -> List[Dict[str, Any]]:
+    """
+    Run a batch of grid simulations using MATLAB if available, otherwise use fallback.
+    
+    Args:
+        loads: Loads in megawatts
+        generations: Generations in megawatts (same length as loads)
+        
+    Returns:
+        list: One simulation result dict per input pair
+    """
+    if engine_state.available:
+        try:
+            return run_matlab_simulation_batch(loads, generations)
+        except Exception as e:
+            logger.error(f"MATLAB batch simulation failed, falling back to Python: {e}")
+            return run_fallback_simulation_batch(loads, generations)
+    else:
+        return run_fallback_simulation_batch(loads, generations)
@@ -0,0 +1,123 @@
+"""
+Smoke tests for the MATLAB Engine connection module.
+
+A stub `matlab` package stands in for MATLAB Engine for Python so the
+MATLAB code paths run without a MATLAB installation.
+
+Run with:
+    python -m unittest test_matlab_engine
+"""
+
+import sys
+import types
+import unittest
+
+import matlab_engine
+
+
+class _Double:
+    """Minimal stand-in for matlab.double (a 2-D row of values)."""
+    def __init__(self, values, size=None):
+        self._rows = [list(values)]
+
+    def __getitem__(self, index):
+        return self._rows[index]
+
+
+class _Future:
+    """Stand-in for the future returned by start_matlab(background=True)."""
+    def __init__(self, engine):
+        self._engine = engine
+
+    def result(self):
+        return self._engine
+
+
+class _StubEngine:
+    """Answers grid_simulation calls using the Python fallback model."""
+    def __init__(self):
+        self.calls = 0
+        self.closed = False
+
+    def grid_simulation(self, load_mw, generation_mw):
+        self.calls += 1
+        return matlab_engine.run_fallback_simulation(load_mw, generation_mw)
+
+    def grid_simulation_vec(self, loads, generations):
+        self.calls += 1
+        rows = matlab_engine.run_fallback_simulation_batch(loads[0], generations[0])
+        struct = {}
+        for key in matlab_engine._NUMERIC_FIELDS:
+            struct[key] = _Double([row[key] for row in rows])
+        for key in matlab_engine._STRING_FIELDS:
+            struct[key] = [row[key] for row in rows]
+        return struct
+
+    def quit(self):
+        self.closed = True
+
+
+class MatlabModeTest(unittest.TestCase):
+    """Drive the MATLAB branch of run_simulation/run_simulation_batch."""
+
+    def setUp(self):
+        self.engines = []
+
+        def start_matlab(options="", background=False):
+            engine = _StubEngine()
+            self.engines.append(engine)
+            return _Future(engine)
+
+        matlab = types.ModuleType("matlab")
+        matlab.double = _Double
+        matlab.engine = types.ModuleType("matlab.engine")
+        matlab.engine.start_matlab = start_matlab
+        self._saved_modules = {name: sys.modules.get(name) for name in ("matlab", "matlab.engine")}
+        sys.modules["matlab"] = matlab
+        sys.modules["matlab.engine"] = matlab.engine
+
+        matlab_engine._cached_matlab_simulation.cache_clear()
+        self.assertTrue(matlab_engine.initialize_matlab_engine())
+
+    def tearDown(self):
+        matlab_engine.shutdown_matlab_engine()
+        matlab_engine._cached_matlab_simulation.cache_clear()
+        for name, module in self._saved_modules.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+    def test_run_simulation_uses_matlab(self):
+        result = matlab_engine.run_simulation(1000.0, 1080.0)
+
+        self.assertEqual(result['simulation_mode'], 'MATLAB')
+        self.assertEqual(result['stability_status'], 'WARNING')
+        self.assertEqual(result['power_imbalance_mw'], 80.0)
+        self.assertEqual(sum(engine.calls for engine in self.engines), 1)
+
+    def test_run_simulation_uses_exact_inputs(self):
+        result = matlab_engine.run_simulation(1000.0, 1050.004)
+        cached = matlab_engine.run_simulation(1000.0, 1050.004)
+
+        self.assertEqual(result['generation_mw'], 1050.004)
+        self.assertEqual(result['stability_status'], 'WARNING')
+        self.assertEqual(cached['stability_status'], 'WARNING')
+        self.assertEqual(sum(engine.calls for engine in self.engines), 1)
+
+    def test_run_simulation_batch_uses_matlab(self):
+        results = matlab_engine.run_simulation_batch([1000.0, 1000.0], [1000.0, 850.0])
+
+        self.assertEqual([r['simulation_mode'] for r in results], ['MATLAB', 'MATLAB'])
+        self.assertEqual([r['stability_status'] for r in results], ['STABLE', 'CRITICAL'])
+        self.assertEqual(sum(engine.calls for engine in self.engines), 1)
+
+    def test_shutdown_quits_all_engines(self):
+        matlab_engine.shutdown_matlab_engine()
+
+        self.assertFalse(matlab_engine.is_matlab_available())
+        self.assertTrue(all(engine.closed for engine in self.engines))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -49,6 +49,28 @@ fprintf('\nTest 8: Zero Load\n');
 result8 = grid_simulation(0, 100);
 display_result(result8);
 
+%% Test Case 9: Vectorized Simulation Matches Scalar Results
+fprintf('\nTest 9: Vectorized Simulation (grid_simulation_vec)\n');
+loads = [1000, 1000, 1050, 1000, 1000, 100, 5000, 0];
+generations = [1000, 1020, 1000, 1080, 1150, 105, 5000, 100];
+vec_result = grid_simulation_vec(loads, generations);
+numeric_fields = {'load_mw', 'generation_mw', 'power_imbalance_mw', ...
+    'system_frequency_hz', 'frequency_deviation_hz', 'voltage_pu', ...
+    'stability_index', 'efficiency_percent'};
+for k = 1:numel(loads)
+    scalar_result = grid_simulation(loads(k), generations(k));
+    for f = 1:numel(numeric_fields)
+        field = numeric_fields{f};
+        assert(abs(vec_result.(field)(k) - scalar_result.(field)) < 1e-12, ...
+            'Scenario %d: %s differs from grid_simulation', k, field);
+    end
+    assert(strcmp(vec_result.stability_status{k}, scalar_result.stability_status), ...
+        'Scenario %d: stability_status differs from grid_simulation', k);
+    assert(strcmp(vec_result.warning{k}, scalar_result.warning), ...
+        'Scenario %d: warning differs from grid_simulation', k);
+end
+fprintf('  All %d scenarios match grid_simulation\n', numel(loads));
+
 fprintf('\n=== All Tests Completed ===\n');
 
 %% Helper function to display results